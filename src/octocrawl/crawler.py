@@ -1,12 +1,28 @@
 import asyncio
+import collections
+import concurrent.futures
+import functools
+import io
 import json
+import multiprocessing
+import os
 import sys
 import time
 import bs4
 
-from urllib.parse import urlparse, urlunparse, urljoin
-from octocrawl.http_request import http_request, configure_client
-from octocrawl.parser import html_parser, json_parser, dir_listing_parser
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from rbloom import Bloom
+except ImportError:
+    Bloom = None
+
+from urllib.parse import urlparse, urlunparse
+from octocrawl.http_request import http_request, create_client
+from octocrawl.parser import html_parser, json_parser, dir_listing_parser, HTMLParser, lxml_document, resolve_parser, build_keyword_matcher
 from octocrawl.tree_maker import TreeMaker
 from octocrawl.ui import print_status_line, gradient_text, whole_line
 from octocrawl.fingerprint import fingerprint_technologies
@@ -16,6 +32,75 @@ from octocrawl.robots_sitemap import check_robots_txt, check_sitemap_xml, discov
 # robots.txt is attacker-controlled input, cap whatever Crawl-delay it asks for
 MAX_CRAWL_DELAY = 30.0
 
+# crashed parsing processes tolerated before pages are parsed in threads instead
+MAX_PARSE_POOL_RESTARTS = 3
+
+# false positive rate of the optional Bloom filter (--bloom), i.e. share of new URLs skipped
+BLOOM_ERROR_RATE = 0.001
+
+# seconds between two redraws of the "Checked: ..." status line
+STATUS_REFRESH_INTERVAL = 0.1
+
+# headers are fingerprinted on every response (the headers module reads them from
+# technologies), only the body scan is sampled: it stops once these are known, and
+# past the first responses only 1 in N bodies is still scanned
+FINGERPRINT_SATURATED = frozenset({'Generator (Meta)'})
+FINGERPRINT_FULL_RESPONSES = 20
+FINGERPRINT_SAMPLE_RATE = 10
+
+
+class _BloomVisitedSet:
+    # stands in for the visited_urls set on huge crawls: memory is fixed by the
+    # capacity instead of growing by one Python string per URL, at the cost of
+    # skipping a never-seen URL now and then (the false positive rate)
+    def __init__(self, capacity, error_rate=BLOOM_ERROR_RATE):
+        self._bloom = Bloom(capacity, error_rate)
+
+    def __contains__(self, url):
+        return url in self._bloom
+
+    def add(self, url):
+        self._bloom.add(url)
+
+    def __ior__(self, urls):
+        self._bloom.update(urls)
+        return self
+
+    def __rsub__(self, urls):
+        # `new_links - visited_urls` in worker()
+        return {url for url in urls if url not in self._bloom}
+
+
+class _Frontier:
+    # the URL queue: same get/put_nowait/task_done/join surface as asyncio.Queue, but
+    # a plain deque underneath, get() only touches an Event once the frontier runs dry
+    def __init__(self):
+        self._urls = collections.deque()
+        self._has_work = asyncio.Event()
+        self._unfinished = 0
+        self._all_done = asyncio.Event()
+        self._all_done.set()
+
+    def put_nowait(self, url):
+        self._urls.append(url)
+        self._unfinished += 1
+        self._all_done.clear()
+        self._has_work.set()
+
+    async def get(self):
+        while not self._urls:
+            self._has_work.clear()
+            await self._has_work.wait()
+        return self._urls.popleft()
+
+    def task_done(self):
+        self._unfinished -= 1
+        if self._unfinished <= 0:
+            self._all_done.set()
+
+    async def join(self):
+        await self._all_done.wait()
+
 
 class _CrawlDelayLimiter:
     # keeps requests spaced `interval` seconds apart across all workers combined
@@ -35,21 +120,76 @@ class _CrawlDelayLimiter:
             self._next_allowed_time = now + self.interval
 
 
+@functools.lru_cache(maxsize=200_000)
+def _strip_query_and_fragment(url):
+    # the same URL gets normalized several times over a crawl (worker, link dedup, dir checks)
+    return urlunparse(urlparse(url)._replace(query='', fragment=''))
+
+
+def _handle_html(content, canonical_url, parser_engine):
+    # one parse per page, reused by whichever parser class handles it
+    if parser_engine == 'selectolax':
+        tree = HTMLParser(content)
+        title = tree.css_first('title')
+        is_listing = title is not None and "Index of /" in title.text()
+        parser_cls = dir_listing_parser if is_listing else html_parser
+        return parser_cls(content, canonical_url, tree=tree)
+
+    if parser_engine == 'lxml':
+        root = lxml_document(content)
+        if root is None:
+            return None
+        is_listing = "Index of /" in (root.findtext('.//title') or "")
+        parser_cls = dir_listing_parser if is_listing else html_parser
+        return parser_cls(content, canonical_url, root=root)
+
+    soup = bs4.BeautifulSoup(content, parser_engine)
+    is_listing = soup.title and "Index of /" in (soup.title.string or "")
+    return (dir_listing_parser(content, canonical_url, soup=soup, parser=parser_engine)
+            if is_listing else
+            html_parser(content, canonical_url, soup=soup, parser=parser_engine))
+
+
+def _handle_json(content, canonical_url, parser_engine):
+    return json_parser(content, canonical_url)
+
+
+# keyed on the bare MIME type, anything not listed here isn't parsed for links
+CONTENT_HANDLERS = {
+    'text/html': _handle_html,
+    'application/xhtml+xml': _handle_html,
+    'application/json': _handle_json,
+    'text/json': _handle_json,
+}
+
+
+# set in each parsing process by _init_parse_process(), built once instead of per page
+_keyword_matcher = None
+
+
+def _init_parse_process(keywords):
+    global _keyword_matcher
+    _keyword_matcher = build_keyword_matcher(keywords)
+
+
+def _parse_in_process(content, content_type, canonical_url, parser_engine):
+    # runs in the parsing pool (see worker()): only the page text goes in and plain
+    # lists/dicts come back, the parsed tree never leaves the process
+    return _parse_content(content, content_type, canonical_url, parser_engine, _keyword_matcher)
+
+
 def _parse_content(content, content_type, canonical_url, parser_engine, keywords):
-    # runs in a worker thread (see worker()), this is CPU-bound and would
-    # otherwise stall the event loop for every other in-flight request
-    parser = None
-
-    if 'html' in content_type:
-        soup = bs4.BeautifulSoup(content, parser_engine)
-        is_listing = soup.title and "Index of /" in soup.title.string
-        parser = (dir_listing_parser(content, canonical_url, soup=soup, parser=parser_engine)
-                  if is_listing else
-                  html_parser(content, canonical_url, soup=soup, parser=parser_engine))
-    elif 'json' in content_type:
-        parser = json_parser(content, canonical_url)
-
-    if not parser:
+    # CPU-bound, it would otherwise stall the event loop for every other in-flight request
+    mime = content_type.split(';', 1)[0].strip().lower()
+    handler = CONTENT_HANDLERS.get(mime)
+    if handler is None and mime.endswith('+json'):
+        handler = _handle_json
+
+    if handler is None:
+        return [], {}
+
+    parser = handler(content, canonical_url, parser_engine)
+    if parser is None:
         return [], {}
 
     links = parser.internal_links
@@ -57,55 +197,94 @@ def _parse_content(content, content_type, canonical_url, parser_engine, keywords
     return links, found_keywords
 
 
+def _write_report(output_file, sitemap, tree_text, summary_line):
+    if output_file.lower().endswith('.json'):
+        # both writers produce the same bytes: 2-space indent, UTF-8 left unescaped
+        if orjson is not None:
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(sitemap, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(sitemap, f, indent=2, ensure_ascii=False)
+    else:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(tree_text)
+            f.write(summary_line + "\n")
+
+
 class crawler:
-    def __init__(self, start_url, max_workers=50, timeout=5, cookies=None, parser="lxml", random_agent=False, custom_agent=None):
+    def __init__(self, start_url, max_workers=50, timeout=5, cookies=None, parser="lxml", random_agent=False, custom_agent=None, bloom_capacity=None):
         self.start_url = start_url
         self.base_domain = urlparse(start_url).netloc
+        self._origin = f"{urlparse(start_url).scheme}://{self.base_domain}"
         self.timeout = timeout
         self.cookies = cookies if cookies is not None else {}
-        self.parser_engine = parser
+        self.parser_engine = resolve_parser(parser)
         
-        self.queue = asyncio.Queue()
-        self.visited_urls = {self._normalize_url(start_url)}
+        self.queue = _Frontier()
+        self.visited_urls = _BloomVisitedSet(bloom_capacity) if bloom_capacity else set()
+        self.visited_urls.add(self._normalize_url(start_url))
         self.gathered_urls = {}
         self.sitemap = {}
-        self.checked_for_listing = set()
+        self._dir_paths = set()
 
         self.max_workers = max_workers
-        configure_client(max_workers)
+        self.client = create_client(max_workers, timeout)
+        # robots/sitemap helpers take a request function, bind it to our client
+        self._fetch = functools.partial(http_request, client=self.client)
         self.print_lock = asyncio.Lock()
-        self.sitemap_lock = asyncio.Lock()
-        self.queue_lock = asyncio.Lock()
         self.worker_tasks = []
+        # created by crawl(); while it's None _parse_page() parses in a thread instead
+        self._parse_pool = None
+        self._parse_pool_restarts = 0
+        self._keywords = None
+        self._keyword_matcher = None
 
         self.technologies = {}
         self.tech_lock = asyncio.Lock()
         self.random_agent = random_agent
         self.custom_agent = custom_agent
         self.rate_limiter = None
+        self._latest_status = None
+        self._fingerprinted_responses = 0
 
     @staticmethod
     def _normalize_url(url):
-        return urlunparse(urlparse(url)._replace(query='', fragment=''))
-
-    def _add_to_sitemap(self, url, url_data):
-        parsed_url = urlparse(url)
-        path_segments = parsed_url.path.strip('/').split('/') if parsed_url.path.strip('/') else []
+        # most links carry neither a query nor a fragment, skip the parse round-trip for those
+        if '?' not in url and '#' not in url:
+            return url
+        return _strip_query_and_fragment(url)
+
+    def _add_to_sitemap(self, path, url_data):
+        # takes the already-parsed path from the worker, returns the directory
+        # paths seen for the first time so they can be queued as listings
+        segments = [segment for segment in path.split('/') if segment]
+        if not segments:
+            self.sitemap.setdefault('/', {})['_data'] = url_data
+            return []
+        new_dir_paths = []
+        dir_path = '/'
         current_level = self.sitemap
-        if not path_segments or (len(path_segments) == 1 and path_segments[0] == ''):
-            self.sitemap.setdefault('/', {}).update({'_data': url_data})
-            return
-        for segment in path_segments[:-1]:
-            if not segment: continue
+        for segment in segments[:-1]:
             current_level = current_level.setdefault(segment, {})
-        last_segment = path_segments[-1]
-        if last_segment:
-             current_level.setdefault(last_segment, {}).update({'_data': url_data})
+            # the flat set mirrors every directory node of the tree, so nothing
+            # ever has to walk the sitemap to list them
+            dir_path += segment + '/'
+            if dir_path not in self._dir_paths:
+                self._dir_paths.add(dir_path)
+                new_dir_paths.append(dir_path)
+        current_level.setdefault(segments[-1], {})['_data'] = url_data
+        return new_dir_paths
+
+    def _should_fingerprint(self):
+        if FINGERPRINT_SATURATED <= self.technologies.keys():
+            return False
+        self._fingerprinted_responses += 1
+        return (self._fingerprinted_responses <= FINGERPRINT_FULL_RESPONSES
+                or self._fingerprinted_responses % FINGERPRINT_SAMPLE_RATE == 0)
 
     def _build_urls_from_paths(self, paths):
         urls = []
-        parsed_start = urlparse(self.start_url)
-        base_url = f"{parsed_start.scheme}://{parsed_start.netloc}"
         
         for path in paths:
             path = path.strip()
@@ -113,12 +292,12 @@ class crawler:
                 continue
             if not path.startswith('/'):
                 path = '/' + path
-            full_url = base_url + path
+            full_url = self._origin + path
             urls.append(full_url)
         
         return urls
 
-    async def worker(self, keywords=None):
+    async def worker(self):
         while True:
             url_to_process = None
             try:
@@ -132,24 +311,25 @@ class crawler:
                     timeout=self.timeout, 
                     cookies=self.cookies, 
                     random_agent=self.random_agent,
-                    custom_agent=self.custom_agent
+                    custom_agent=self.custom_agent,
+                    client=self.client
                 )
                 
-                async with self.print_lock:
-                    print_status_line(f"Checked: {url_to_process} [{request['response_code']}]")
+                self._latest_status = f"Checked: {url_to_process} [{request['response_code']}]"
 
                 if request['done']:
-                    found_tech = fingerprint_technologies(request['headers'], request['content'])
+                    body = request['content'] if self._should_fingerprint() else None
+                    found_tech = fingerprint_technologies(request['headers'], body)
                     if found_tech:
                         async with self.tech_lock:
                             self.technologies.update(found_tech)
 
                 canonical_url = self._normalize_url(url_to_process)
-                
-                async with self.sitemap_lock:
-                    if canonical_url in self.gathered_urls:
-                        self.queue.task_done()
-                        continue
+
+                # no locks around visited_urls/gathered_urls/sitemap: everything runs on
+                # one event loop and none of these check-then-write blocks await in between
+                if canonical_url in self.gathered_urls:
+                    continue
 
                 url_data = { 
                     'code': request["response_code"], 
@@ -161,23 +341,18 @@ class crawler:
                 if request["done"] and request["response_code"] == 200 and request["content"]:
                     content, ctype = request["content"], request["content_type"]
 
-                    loop = asyncio.get_running_loop()
-                    links, found_keywords = await loop.run_in_executor(
-                        None, _parse_content, content, ctype, canonical_url, self.parser_engine, keywords
-                    )
-
-                    for link in links:
-                        normalized_link = self._normalize_url(link)
-                        async with self.queue_lock:
-                            if normalized_link not in self.visited_urls:
-                                self.visited_urls.add(normalized_link)
-                                await self.queue.put(normalized_link)
+                    links, found_keywords = await self._parse_page(content, ctype, canonical_url)
+
+                    new_links = {self._normalize_url(link) for link in links} - self.visited_urls
+                    self.visited_urls |= new_links
+                    for link in new_links:
+                        self.queue.put_nowait(link)
                     if found_keywords:
                         url_data['keywords'] = found_keywords
                 
-                async with self.sitemap_lock:
-                    self.gathered_urls[canonical_url] = url_data
-                    self._add_to_sitemap(canonical_url, url_data)
+                path = urlparse(canonical_url).path
+                self.gathered_urls[canonical_url] = url_data
+                self._enqueue_directories(self._add_to_sitemap(path, url_data))
 
             except asyncio.CancelledError:
                 break
@@ -188,27 +363,83 @@ class crawler:
                 if url_to_process:
                     self.queue.task_done()
 
-    async def _crawl_loop(self, keywords=None):
-        self.worker_tasks = [asyncio.create_task(self.worker(keywords)) for _ in range(self.max_workers)]
+    def _start_parse_pool(self):
+        # parsing is CPU-bound and holds the GIL, one process per core parses pages in parallel.
+        # forkserver: forking this process would copy the httpx client and its resolver threads
+        start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else None
+        self._parse_pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=os.cpu_count() or 1,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_parse_process,
+            initargs=(self._keywords,)
+        )
+
+    def _replace_parse_pool(self, broken_pool):
+        # every worker waiting on the broken pool lands here, only the first one replaces it
+        if self._parse_pool is not broken_pool:
+            return
+        broken_pool.shutdown(wait=False, cancel_futures=True)
+        self._parse_pool_restarts += 1
+        if self._parse_pool_restarts > MAX_PARSE_POOL_RESTARTS:
+            self._parse_pool = None
+            print("\n[!] Parsing processes keep crashing, parsing in threads from now on.")
+        else:
+            print("\n[!] A parsing process crashed, restarting the parsing pool.")
+            self._start_parse_pool()
+
+    async def _parse_page(self, content, content_type, canonical_url):
+        loop = asyncio.get_running_loop()
+        # a dead worker (crash, OOM kill) breaks the whole pool: replace it and retry the page once
+        for _ in range(2):
+            pool = self._parse_pool
+            if pool is None:
+                break
+            try:
+                return await loop.run_in_executor(
+                    pool, _parse_in_process, content, content_type, canonical_url, self.parser_engine
+                )
+            except concurrent.futures.process.BrokenProcessPool:
+                self._replace_parse_pool(pool)
+
+        return await loop.run_in_executor(
+            None, _parse_content, content, content_type, canonical_url, self.parser_engine, self._keyword_matcher
+        )
+
+    def _enqueue_directories(self, dir_paths):
+        # every new directory may be a listing: queue it as soon as a URL below it is
+        # gathered, workers pick it up in the same pass
+        for dir_path in dir_paths:
+            dir_url = self._origin + dir_path
+            if dir_url not in self.visited_urls:
+                self.visited_urls.add(dir_url)
+                self.queue.put_nowait(dir_url)
+
+    async def _status_reporter(self):
+        # workers only record their latest status, this redraws it at a fixed rate so
+        # the terminal write + flush happens ~10 times a second instead of once per URL
+        shown = None
+        while True:
+            await asyncio.sleep(STATUS_REFRESH_INTERVAL)
+            status = self._latest_status
+            if status is not None and status is not shown:
+                async with self.print_lock:
+                    print_status_line(status)
+                shown = status
+
+    async def _crawl_loop(self):
+        # workers are spawned once and the queue joined once, directory candidates
+        # are fed back in-band by _enqueue_directories()
+        self.worker_tasks = [asyncio.create_task(self.worker()) for _ in range(self.max_workers)]
+        self.worker_tasks.append(asyncio.create_task(self._status_reporter()))
         await self.queue.join()
 
-    def _get_all_directory_urls(self, sitemap_node=None, current_path_url=None):
-        if sitemap_node is None: sitemap_node = self.sitemap
-        if current_path_url is None: current_path_url = self.start_url
-        dir_urls = set()
-        for key, value in sitemap_node.items():
-            children = {k: v for k, v in value.items() if k != '_data'}
-            if children:
-                base_for_join = current_path_url if current_path_url.endswith('/') else current_path_url + '/'
-                dir_url = urljoin(base_for_join, key + '/')
-                dir_urls.add(dir_url)
-                dir_urls.update(self._get_all_directory_urls(children, dir_url))
-        return dir_urls
-    
     async def shutdown(self):
         for task in self.worker_tasks:
             task.cancel()
         await asyncio.gather(*self.worker_tasks, return_exceptions=True)
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=False, cancel_futures=True)
+        await self.client.aclose()
 
     async def crawl(self, show_url_in_tree=False, noshow_extensions=None, display_extensions=None, keywords=None, output_file=None, additional_paths=None, check_robots=True, check_sitemap=True):
         start_time = time.time()
@@ -217,7 +448,7 @@ class crawler:
         sitemap_urls = []
         
         if check_robots:
-            robots_result = await check_robots_txt(self.start_url, http_request, self.print_lock, custom_agent=self.custom_agent)
+            robots_result = await check_robots_txt(self.start_url, self._fetch, self.print_lock, custom_agent=self.custom_agent)
             
             if robots_result['disallowed_paths']:
                 async with self.print_lock:
@@ -237,11 +468,11 @@ class crawler:
         all_sitemap_urls = []
         if check_sitemap:
             if not sitemap_urls:
-                discovered = await discover_sitemaps(self.start_url, http_request, self.print_lock, custom_agent=self.custom_agent)
+                discovered = await discover_sitemaps(self.start_url, self._fetch, self.print_lock, custom_agent=self.custom_agent)
                 sitemap_urls.extend(discovered)
             
             for sitemap_url in sitemap_urls:
-                urls = await check_sitemap_xml(sitemap_url, http_request, self.print_lock, self.base_domain, custom_agent=self.custom_agent)
+                urls = await check_sitemap_xml(sitemap_url, self._fetch, self.print_lock, self.base_domain, custom_agent=self.custom_agent)
                 all_sitemap_urls.extend(urls)
             
             if all_sitemap_urls:
@@ -273,26 +504,13 @@ class crawler:
                 self.visited_urls.add(normalized_url)
                 self.queue.put_nowait(url)
         
+        self._keywords = keywords
+        self._keyword_matcher = build_keyword_matcher(keywords)
+        self._start_parse_pool()
+
         try:
-            await self._crawl_loop(keywords)
+            await self._crawl_loop()
             print(f"\r{whole_line()}")
-            
-            while True:
-                all_dirs = self._get_all_directory_urls()
-                new_dirs_to_check = all_dirs - self.checked_for_listing
-                if not new_dirs_to_check: 
-                    break
-                
-                async with self.queue_lock:
-                    for d in new_dirs_to_check:
-                        normalized_dir = self._normalize_url(d)
-                        if normalized_dir not in self.visited_urls:
-                            self.visited_urls.add(normalized_dir)
-                            await self.queue.put(d)
-                
-                self.checked_for_listing.update(new_dirs_to_check)
-                await self._crawl_loop(keywords)
-                    
         except asyncio.CancelledError:
             async with self.print_lock: 
                 print(gradient_text("\n🐙 Crawl cancelled by user. Exiting."))
@@ -306,7 +524,11 @@ class crawler:
         print(gradient_text("🐙 Crawl finished. Generating sitemap tree..."))
         
         tree_maker = TreeMaker(base_url=self.start_url, noshow=noshow_extensions, display_only=display_extensions)
-        tree_maker.print_tree(self.sitemap, show_url=show_url_in_tree)
+        # rendered once, the same text goes to the terminal and to the report file
+        tree_buffer = io.StringIO()
+        tree_maker.print_tree(self.sitemap, show_url=show_url_in_tree, output_stream=tree_buffer)
+        tree_text = tree_buffer.getvalue()
+        sys.stdout.write(tree_text)
 
         total_urls = len(self.gathered_urls)
         summary_line = f"\nGathered {total_urls} unique URLs in {round(end_time-start_time, 3)} seconds"
@@ -315,13 +537,10 @@ class crawler:
         if output_file:
             print(f"Saving report to {output_file}...")
             try:
-                if output_file.lower().endswith('.json'):
-                    with open(output_file, 'w', encoding='utf-8') as f:
-                        json.dump(self.sitemap, f, indent=4)
-                else:
-                    with open(output_file, 'w', encoding='utf-8') as f:
-                        tree_maker.print_tree(self.sitemap, show_url=show_url_in_tree, output_stream=f)
-                        f.write(summary_line + "\n")
+                # blocking disk I/O, keep it off the event loop
+                await asyncio.to_thread(
+                    _write_report, output_file, self.sitemap, tree_text, summary_line
+                )
                 print(f"Report saved successfully.")
             except Exception as e:
                 print(f"\nError saving report to {output_file}: {e}", file=sys.stderr)
\ No newline at end of file
@@ -26,24 +26,44 @@ CONTENT_SIGNATURES = {
     'Generator (Meta)': re.compile(r'<meta\s+name=["\']generator["\']\s+content=["\']([^"\']+)["\']', re.IGNORECASE),
 }
 
+# built once at import: a set intersection picks the headers we care about, and all
+# content signatures are merged into one regex so the body is scanned a single time
+# no matter how many signatures get added
+_HEADER_KEYS = frozenset(INTERESTING_HEADERS)
+
+_SIGNATURE_NAMES = {f'sig{i}': name for i, name in enumerate(CONTENT_SIGNATURES)}
+_COMBINED_SIGNATURES = re.compile(
+    '|'.join(f'(?P<{group}>{CONTENT_SIGNATURES[name].pattern})' for group, name in _SIGNATURE_NAMES.items()),
+    re.IGNORECASE
+)
+
+
 def fingerprint_technologies(headers, content):
+    # header keys are expected lowercase, as httpx returns them
     found_tech = {}
     
-    for header_key, display_name in INTERESTING_HEADERS.items():
-        header_value = headers.get(header_key.lower())
+    for header_key in _HEADER_KEYS & headers.keys():
+        header_value = headers[header_key]
         if header_value:
-            found_tech[display_name] = header_value.strip()
+            found_tech[INTERESTING_HEADERS[header_key]] = header_value.strip()
 
     if content:
-        for display_name, pattern in CONTENT_SIGNATURES.items():
-            match = pattern.search(content)
-            if match:
-                found_tech[display_name] = match.group(1).strip()
+        remaining = len(_SIGNATURE_NAMES)
+        for match in _COMBINED_SIGNATURES.finditer(content):
+            group = match.lastgroup
+            display_name = _SIGNATURE_NAMES[group]
+            if display_name in found_tech:
+                continue
+            # each signature captures its value in the first group after its own wrapper group
+            found_tech[display_name] = match.group(_COMBINED_SIGNATURES.groupindex[group] + 1).strip()
+            remaining -= 1
+            if not remaining:
+                break
 
-    cookie_header = headers.get('set-cookie', '')
-    if 'phpsessid' in cookie_header.lower():
+    cookie_header = headers.get('set-cookie', '').lower()
+    if 'phpsessid' in cookie_header:
         if 'Session' not in found_tech: found_tech['Session'] = 'PHP (PHPSESSID cookie)'
-    elif 'jsessionid' in cookie_header.lower():
+    elif 'jsessionid' in cookie_header:
         if 'Session' not in found_tech: found_tech['Session'] = 'Java (JSESSIONID cookie)'
 
-    return found_tech
\ No newline at end of file
+    return found_tech
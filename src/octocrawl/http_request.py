@@ -1,46 +1,96 @@
 import httpx
 import os
 import re
+import socket
 from urllib.parse import urlparse
 from octocrawl.user_agents import RandomUserAgent
 
 GET_REQUEST_EXTENSIONS = {'.html', '.htm', '.php', '.js', '.css', '.json', '.xml', '.svg', '.txt'}
 
+# str.endswith() takes a tuple and checks every suffix in C
+GET_REQUEST_SUFFIXES = tuple(GET_REQUEST_EXTENSIONS)
+
+# non text/* types whose body is still worth decoding
+TEXTUAL_CONTENT_MARKERS = ('json', 'xml', 'javascript', 'ecmascript')
+
 # matches embedded base64 data used as a fake URL path, e.g. /image/png;base64,...
 _BASE64_URL_PATTERN = re.compile(r'[;,]base64,')
 
 _client = None
-_client_limits = None
 
 
-def configure_client(max_workers: int):
-    # call before the first request: httpx defaults to 20 keepalive connections,
-    # not enough once max_workers goes higher than that
-    global _client_limits
-    _client_limits = httpx.Limits(
-        max_connections=max_workers,
+def _make_transport(limits: httpx.Limits) -> httpx.AsyncHTTPTransport:
+    # once a transport is passed, AsyncClient ignores its own http2/verify/limits
+    # arguments, so everything connection-related is set here
+    return httpx.AsyncHTTPTransport(
+        http2=True,
+        verify=False,
+        retries=0,
+        limits=limits,
+        socket_options=[(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)],
+    )
+
+
+def create_client(max_workers: int, timeout: float = 10) -> httpx.AsyncClient:
+    # one client per crawl keeps TCP+TLS connections warm across requests, and
+    # httpx only keeps 20 connections alive by default, not enough for max_workers
+    limits = httpx.Limits(
+        max_connections=max_workers * 2,
         max_keepalive_connections=max_workers,
+        keepalive_expiry=30,
+    )
+    return httpx.AsyncClient(
+        transport=_make_transport(limits),
+        follow_redirects=True,
+        timeout=timeout,
     )
 
 
 def _get_client():
+    # shared fallback for callers that don't own a client (modules, robots/sitemap helpers)
     global _client
     if _client is None:
         _client = httpx.AsyncClient(
-            http2=True,
+            transport=_make_transport(httpx.Limits()),
             follow_redirects=True,
             timeout=10,
-            verify=False,
-            limits=_client_limits or httpx.Limits(),
         )
     return _client
 
+def _is_textual(content_type) -> bool:
+    # no Content-Type at all: decode anyway, the parsers will sort it out
+    if not content_type:
+        return True
+    content_type = content_type.lower()
+    return content_type.startswith('text/') or any(marker in content_type for marker in TEXTUAL_CONTENT_MARKERS)
+
+
+def _uses_get_request(url: str) -> bool:
+    """GET pages we may parse (known text extensions or no extension at all), HEAD the rest."""
+    if not url.startswith(('http://', 'https://')) or not url.isprintable():
+        # anything unusual goes through urlparse, which owns all the edge cases
+        _, extension = os.path.splitext(urlparse(url).path.lower())
+        return (extension in GET_REQUEST_EXTENSIONS) or (not extension)
+
+    # plain string slicing instead of urlparse + os.path.splitext, this runs for every request
+    url = url.split('#', 1)[0].split('?', 1)[0]
+    path_start = url.find('/', url.find('://') + 3)
+    if path_start == -1:
+        return True
+    # like urlparse, ";params" on the last segment aren't part of the path
+    last_segment = url[path_start:].rsplit('/', 1)[-1].split(';', 1)[0].lower()
+    # leading dots don't start an extension for splitext(): .htaccess, .., ...png
+    if '.' not in last_segment.lstrip('.'):
+        return True
+    return last_segment.endswith(GET_REQUEST_SUFFIXES)
+
+
 def _is_invalid_url(url: str) -> bool:
     """Return True if the URL should be skipped (e.g. contains embedded base64 data)."""
     return bool(_BASE64_URL_PATTERN.search(url))
 
 
-async def http_request(url, timeout=5, cookies=None, random_agent=False, custom_agent=None, extra_headers=None):
+async def http_request(url, timeout=5, cookies=None, random_agent=False, custom_agent=None, extra_headers=None, client=None):
     result = {
         "response_code": "Error",
         "done": False,
@@ -70,11 +120,10 @@ async def http_request(url, timeout=5, cookies=None, random_agent=False, custom_
         if extra_headers:
             request_headers.update(extra_headers)
 
-        path = urlparse(url).path
-        _, extension = os.path.splitext(path.lower())
-        use_get_request = (extension in GET_REQUEST_EXTENSIONS) or (not extension)
+        use_get_request = _uses_get_request(url)
 
-        client = _get_client()
+        if client is None:
+            client = _get_client()
 
         if use_get_request:
             response = await client.get(
@@ -83,7 +132,11 @@ async def http_request(url, timeout=5, cookies=None, random_agent=False, custom_
                 cookies=cookies,
                 headers=request_headers
             )
-            result["content"] = response.text
+            body = await response.aread()
+            # only decode what we'll actually parse; response.encoding is the declared
+            # charset when Python knows the codec, utf-8 otherwise (e.g. charset=bogus)
+            if body and _is_textual(response.headers.get('Content-Type')):
+                result["content"] = body.decode(response.encoding, errors='replace')
         else:
             response = await client.head(
                 url,
@@ -93,13 +146,16 @@ async def http_request(url, timeout=5, cookies=None, random_agent=False, custom_
             )
             result["content"] = ""
         
-        result["response_code"] = int(response.status_code)
-        result["headers"] = dict(response.headers)
+        code = response.status_code
+        result["response_code"] = code
+        # httpx.Headers is already a case-insensitive mapping, no need to copy it
+        result["headers"] = response.headers
 
         # 4xx/5xx happen on almost every crawl, so check the status directly
         # instead of raise_for_status()/except - exceptions aren't free and this
-        # runs on every single request
-        if not response.is_error:
+        # runs on every single request. Same test as httpx's is_error, so
+        # non-standard codes such as 999 still count as a response
+        if not 400 <= code < 600:
             result["content_type"] = response.headers.get('Content-Type', 'unknown')
             result["done"] = True
 
@@ -2,10 +2,10 @@
 import argparse
 import sys
 import importlib.resources
+import importlib.util
 import asyncio
 import time
 
-from octocrawl.crawler import crawler
 from octocrawl.ui import display_art, gradient_text, print_report_box
 from octocrawl.modules.example import CrawlContext
 from octocrawl.modules.module_manager import ModuleManager
@@ -53,8 +53,10 @@ async def main():
                         help="Skip checking robots.txt")
     parser.add_argument("--no-sitemap", "-ns", action="store_true",
                         help="Skip checking sitemap.xml")
-    parser.add_argument("--parser", type=str, default="html.parser",
-                        help="HTML parser to use: 'lxml' (fast) or 'html.parser' (built-in).")
+    parser.add_argument("--parser", type=str, default=None,
+                        help="HTML parser to use: 'selectolax' (fastest), 'lxml' (default, 'html.parser' if lxml is missing) or 'html.parser' (built-in).")
+    parser.add_argument("--bloom", type=int, default=0, metavar="NUM",
+                        help="Track visited URLs in a Bloom filter sized for NUM URLs (needs rbloom).\nBounds memory on huge crawls, a few URLs may be skipped.")
     parser.add_argument("--version", action="store_true",
                         help="Display the current version of OctoCrawl.")
     parser.add_argument("-M", "--modules", type=str, default="", metavar="mod1,mod2",
@@ -74,7 +76,9 @@ async def main():
     modules_ref = importlib.resources.files("octocrawl").joinpath("modules")
     with importlib.resources.as_file(modules_ref) as modules_path:
         module_manager = ModuleManager(modules_path)
-        module_manager.load_all_modules()
+        # loading executes every module file, only pay for it when modules are involved
+        if args.list_modules or args.module_info or args.modules:
+            module_manager.load_all_modules()
 
         if args.list_modules:
             print(gradient_text("\n🔧 Available Modules:\n"))
@@ -125,6 +129,10 @@ async def main():
         if not args.url:
             parser.error("the 'url' argument is required to start a crawl. (Use --help for more info)")
 
+        # imported here: pulls in bs4 and httpx, which meta commands above never need
+        from octocrawl.crawler import crawler
+        from octocrawl.parser import DEFAULT_PARSER
+
         if args.ignore and args.display:
             print("Error: Cannot use both --ignore and --display options simultaneously.", file=sys.stderr)
             sys.exit(1)
@@ -133,6 +141,15 @@ async def main():
             print("Error: Cannot use both --random-agent and --agent options simultaneously.", file=sys.stderr)
             sys.exit(1)
 
+        # only an explicit --parser is an error, the default quietly falls back to html.parser
+        if args.parser in ('selectolax', 'lxml') and importlib.util.find_spec(args.parser) is None:
+            print(f"Error: --parser {args.parser} requires the '{args.parser}' package (pipx inject octocrawl {args.parser}).", file=sys.stderr)
+            sys.exit(1)
+
+        if args.bloom and importlib.util.find_spec('rbloom') is None:
+            print("Error: --bloom requires the 'rbloom' package (pipx inject octocrawl rbloom).", file=sys.stderr)
+            sys.exit(1)
+
         display_art()
 
         keywords_list = [kw.strip().lower() for kw in args.keywords.split(',') if kw]
@@ -154,7 +171,7 @@ async def main():
             "Version": current_version,
             "Workers": args.workers,
             "Timeout": f"{args.timeout}s",
-            "Parser": args.parser,
+            "Parser": args.parser or DEFAULT_PARSER,
             "Cookies": "Yes" if args.cookies else "No",
         }
 
@@ -171,6 +188,8 @@ async def main():
             config_data["Additional Paths"] = ', '.join(additional_paths)
         if args.output:
             config_data["Output File"] = args.output
+        if args.bloom:
+            config_data["Visited URLs"] = f"Bloom filter ({args.bloom} URLs)"
         if args.ignore:
             config_data["Ignored Extensions"] = args.ignore
         if args.display:
@@ -207,7 +226,8 @@ async def main():
             cookies=cookies_dict,
             random_agent=args.random_agent,
             custom_agent=args.agent if args.agent else None,
-            parser=args.parser
+            parser=args.parser or DEFAULT_PARSER,
+            bloom_capacity=args.bloom or None
         )
 
         await my_crawler.crawl(
@@ -1,10 +1,12 @@
+import heapq
+import importlib.util
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
 
-@dataclass
+@dataclass(slots=True)
 class CrawlContext:
     """Context shared with all modules after the crawl"""
     
@@ -25,26 +27,67 @@ class CrawlContext:
     # Additional data that modules can share
     shared_data: Dict[str, Any] = field(default_factory=dict)
     
+    # Column indexes over gathered_urls, built on first lookup. gathered_urls is
+    # treated as frozen once modules run: call invalidate_indexes() after editing it
+    _urls: List[str] = field(default=None, init=False, repr=False, compare=False)
+    _status_index: Dict[Any, List[int]] = field(default=None, init=False, repr=False, compare=False)
+    _content_type_index: Dict[str, List[int]] = field(default=None, init=False, repr=False, compare=False)
+    _keyword_urls: List[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    def _build_indexes(self) -> None:
+        """Splits gathered_urls into per-column indexes of URL positions"""
+        urls = list(self.gathered_urls)
+        status_index: Dict[Any, List[int]] = {}
+        content_type_index: Dict[str, List[int]] = {}
+        keyword_urls = []
+        
+        for position, data in enumerate(self.gathered_urls.values()):
+            status_index.setdefault(data.get('code'), []).append(position)
+            content_type_index.setdefault(data.get('content_type', '').lower(), []).append(position)
+            if data.get('keywords'):
+                keyword_urls.append(urls[position])
+        
+        self._urls = urls
+        self._status_index = status_index
+        self._content_type_index = content_type_index
+        self._keyword_urls = keyword_urls
+    
+    def _indexes_stale(self) -> bool:
+        # only catches added/removed URLs, in-place edits need invalidate_indexes()
+        return self._urls is None or len(self._urls) != len(self.gathered_urls)
+    
+    def invalidate_indexes(self) -> None:
+        """Drops the lookup indexes after gathered_urls was modified in place"""
+        self._urls = None
+    
     def get_urls_by_status(self, status_code: int) -> List[str]:
         """Retrieves all URLs with a specific status code"""
-        return [
-            url for url, data in self.gathered_urls.items()
-            if data.get('code') == status_code
-        ]
+        if self._indexes_stale():
+            self._build_indexes()
+        urls = self._urls
+        return [urls[i] for i in self._status_index.get(status_code, ())]
     
     def get_urls_by_content_type(self, content_type: str) -> List[str]:
         """Retrieves all URLs of a specific content type"""
-        return [
-            url for url, data in self.gathered_urls.items()
-            if content_type.lower() in data.get('content_type', '').lower()
+        if self._indexes_stale():
+            self._build_indexes()
+        
+        # substring match over the few distinct content types, not every URL
+        needle = content_type.lower()
+        matches = [
+            positions for key, positions in self._content_type_index.items()
+            if needle in key
         ]
+        urls = self._urls
+        if len(matches) == 1:
+            return [urls[i] for i in matches[0]]
+        return [urls[i] for i in heapq.merge(*matches)]
     
     def get_urls_with_keywords(self) -> List[str]:
         """Retrieves all URLs containing keywords"""
-        return [
-            url for url, data in self.gathered_urls.items()
-            if data.get('keywords')
-        ]
+        if self._indexes_stale():
+            self._build_indexes()
+        return list(self._keyword_urls)
 
 
 class ModuleMetadata:
@@ -74,6 +117,7 @@ class BaseModule(ABC):
         self.enabled = True
         self.metadata: Optional[ModuleMetadata] = None
         self._context: Optional[CrawlContext] = None
+        self._output_dir_cache: Dict[tuple, Path] = {}
     
     @abstractmethod
     def get_metadata(self) -> ModuleMetadata:
@@ -119,9 +163,12 @@ class BaseModule(ABC):
         
         missing = []
         for package in self.metadata.requires:
+            # find_spec locates the package without executing it
             try:
-                __import__(package)
-            except ImportError:
+                if importlib.util.find_spec(package) is None:
+                    missing.append(package)
+            except (ImportError, ValueError):
+                # dotted name whose parent package is missing
                 missing.append(package)
         
         return len(missing) == 0, missing
@@ -147,15 +194,16 @@ class BaseModule(ABC):
             domain = getattr(self._context, 'base_domain', None) or "unknown-target"
             output_dir = Path.home() / ".octocrawl" / domain
 
-        output_dir.mkdir(parents=True, exist_ok=True)
+        module_name = self.metadata.name if self.metadata else "unknown"
         
-        # Create a subfolder for this module
-        module_dir = output_dir / (self.metadata.name if self.metadata else "unknown")
-        module_dir.mkdir(exist_ok=True)
+        # Create a subfolder for this module, only once per output directory
+        module_dir = self._output_dir_cache.get((output_dir, module_name))
+        if module_dir is None:
+            module_dir = output_dir / module_name
+            module_dir.mkdir(parents=True, exist_ok=True)
+            self._output_dir_cache[(output_dir, module_name)] = module_dir
         
         filepath = module_dir / filename
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+        filepath.write_text(content, encoding='utf-8')
         
         return filepath
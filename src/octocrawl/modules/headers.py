@@ -53,6 +53,16 @@ class SecurityHeadersModule(BaseModule):
         }
     }
     
+    # Weighted scoring based on severity, the header table never changes
+    _SEVERITY_WEIGHT = {'HIGH': 3, 'MEDIUM': 2, 'LOW': 1}
+    _MAX_SCORE = sum(map(
+        _SEVERITY_WEIGHT.__getitem__,
+        (h['severity'] for h in SECURITY_HEADERS.values())
+    ))
+    
+    _SEVERITY_ORDER = {'HIGH': 0, 'MEDIUM': 1, 'LOW': 2}
+    _SEVERITY_EMOJI = {'HIGH': '🔴', 'MEDIUM': '🟡', 'LOW': '🔵'}
+    
     def get_metadata(self) -> ModuleMetadata:
         return ModuleMetadata(
             name="headers",
@@ -74,22 +84,23 @@ class SecurityHeadersModule(BaseModule):
         found_headers = {}
         missing_headers = []
         
-        # Check which headers are present in detected technologies
+        # Check which headers are present in detected technologies,
+        # each technology name is lowercased once up front
+        tech_items_lower = [(k.lower(), v) for k, v in context.technologies.items()]
         for header_key, header_info in self.SECURITY_HEADERS.items():
-            # Check if this header appears in technologies
-            header_found = False
-            for tech_name, tech_value in context.technologies.items():
-                if header_key.lower() in tech_name.lower():
-                    found_headers[header_key] = {
-                        'name': header_info['name'],
-                        'value': tech_value,
-                        'severity': header_info['severity'],
-                        'description': header_info['description']
-                    }
-                    header_found = True
-                    break
+            tech_value = next(
+                (v for name_lower, v in tech_items_lower if header_key in name_lower),
+                None
+            )
             
-            if not header_found:
+            if tech_value is not None:
+                found_headers[header_key] = {
+                    'name': header_info['name'],
+                    'value': tech_value,
+                    'severity': header_info['severity'],
+                    'description': header_info['description']
+                }
+            else:
                 missing_headers.append({
                     'key': header_key,
                     'name': header_info['name'],
@@ -101,14 +112,9 @@ class SecurityHeadersModule(BaseModule):
         total_headers = len(self.SECURITY_HEADERS)
         found_count = len(found_headers)
         
-        # Weighted scoring based on severity
-        max_score = sum(
-            3 if h['severity'] == 'HIGH' else 2 if h['severity'] == 'MEDIUM' else 1
-            for h in self.SECURITY_HEADERS.values()
-        )
-        
+        max_score = self._MAX_SCORE
         current_score = sum(
-            3 if h['severity'] == 'HIGH' else 2 if h['severity'] == 'MEDIUM' else 1
+            self._SEVERITY_WEIGHT[h['severity']]
             for h in found_headers.values()
         )
         
@@ -162,7 +168,7 @@ class SecurityHeadersModule(BaseModule):
             score_emoji = "🔴"
             score_status = "CRITICAL"
         
-        report = f"""# Security Headers Analysis
+        parts = [f"""# Security Headers Analysis
 
 **Target:** {context.start_url}  
 **Security Score:** {score_emoji} {security_score:.1f}% ({score_status})
@@ -178,38 +184,38 @@ class SecurityHeadersModule(BaseModule):
 
 ## ✅ Present Headers
 
-"""
+"""]
         
         if found_headers:
             for header_key, header_data in sorted(found_headers.items()):
-                severity_emoji = "🔴" if header_data['severity'] == 'HIGH' else "🟡" if header_data['severity'] == 'MEDIUM' else "🔵"
-                report += f"\n### {severity_emoji} {header_data['name']}\n\n"
-                report += f"**Severity**: {header_data['severity']}  \n"
-                report += f"**Description**: {header_data['description']}  \n"
-                report += f"**Value**: `{header_data['value']}`\n"
+                severity_emoji = self._SEVERITY_EMOJI[header_data['severity']]
+                parts.append(f"\n### {severity_emoji} {header_data['name']}\n\n")
+                parts.append(f"**Severity**: {header_data['severity']}  \n")
+                parts.append(f"**Description**: {header_data['description']}  \n")
+                parts.append(f"**Value**: `{header_data['value']}`\n")
         else:
-            report += "*No security headers detected*\n"
+            parts.append("*No security headers detected*\n")
         
-        report += "\n---\n\n## ❌ Missing Headers\n\n"
+        parts.append("\n---\n\n## ❌ Missing Headers\n\n")
         
         if missing_headers:
             # Sort by severity
-            severity_order = {'HIGH': 0, 'MEDIUM': 1, 'LOW': 2}
+            severity_order = self._SEVERITY_ORDER
             sorted_missing = sorted(
                 missing_headers,
-                key=lambda x: severity_order.get(x['severity'], 3)
+                key=lambda x: severity_order[x['severity']]
             )
             
             for header in sorted_missing:
-                severity_emoji = "🔴" if header['severity'] == 'HIGH' else "🟡" if header['severity'] == 'MEDIUM' else "🔵"
-                report += f"\n### {severity_emoji} {header['name']}\n\n"
-                report += f"**Severity**: {header['severity']}  \n"
-                report += f"**Description**: {header['description']}  \n"
-                report += f"**Recommendation**: Implement this header\n"
+                severity_emoji = self._SEVERITY_EMOJI[header['severity']]
+                parts.append(f"\n### {severity_emoji} {header['name']}\n\n")
+                parts.append(f"**Severity**: {header['severity']}  \n")
+                parts.append(f"**Description**: {header['description']}  \n")
+                parts.append(f"**Recommendation**: Implement this header\n")
         else:
-            report += "✅ *All recommended headers are present!*\n"
+            parts.append("✅ *All recommended headers are present!*\n")
         
-        report += """
+        parts.append("""
 
 ---
 
@@ -229,6 +235,6 @@ class SecurityHeadersModule(BaseModule):
 - [Mozilla Observatory](https://observatory.mozilla.org/)
 - [Security Headers](https://securityheaders.com/)
 
-"""
+""")
         
-        return report
\ No newline at end of file
+        return ''.join(parts)
\ No newline at end of file
@@ -1,11 +1,16 @@
 import importlib.util
 import asyncio
+import os
+import traceback
 from pathlib import Path
 from typing import List, Dict, Optional, Any
 import sys
 
 from .example import BaseModule, CrawlContext
 
+# files in the modules directory that are not modules themselves
+SKIP = frozenset({'__init__.py', 'example.py', 'module_manager.py'})
+
 
 class ModuleManager:
     """Centralized manager for OctoCrawl modules"""
@@ -25,10 +30,11 @@ class ModuleManager:
         if not self.modules_dir.exists():
             return discovered
         
-        for file in self.modules_dir.glob("*.py"):
-            if file.name in ['__init__.py', 'example.py', 'module_manager.py']:
-                continue
-            discovered.append(file.stem)
+        with os.scandir(self.modules_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.py') or entry.name in SKIP:
+                    continue
+                discovered.append(entry.name[:-3])
         
         return discovered
     
@@ -81,7 +87,6 @@ class ModuleManager:
             
         except Exception as e:
             print(f"❌ Error loading module '{module_name}': {e}")
-            import traceback
             traceback.print_exc()
             return None
     
@@ -132,42 +137,45 @@ class ModuleManager:
         
         return modules_info
     
-    async def run_modules(self, context: CrawlContext) -> Dict[str, Any]:
-        results = {}
-        
-        for module in self.loaded_modules:
-            if not module.enabled:
-                continue
+    async def _run_one(self, module: BaseModule, context: CrawlContext) -> Optional[Dict[str, Any]]:
+        try:
+            print(f"\n🔧 Running module: {module.metadata.name}")
             
+            if not module.setup(context):
+                print(f"❌ Setup failed for module '{module.metadata.name}'")
+                return None
+            
+            result = await module.run(context)
+            print(f"✅ Module '{module.metadata.name}' completed successfully")
+            
+            return {'success': True, 'data': result}
+            
+        except Exception as e:
+            print(f"❌ Error in module '{module.metadata.name}': {e}")
+            traceback.print_exc()
+            return {'success': False, 'error': str(e)}
+        
+        finally:
             try:
-                print(f"\n🔧 Running module: {module.metadata.name}")
-                
-                if not module.setup(context):
-                    print(f"❌ Setup failed for module '{module.metadata.name}'")
-                    continue
-                
-                result = await module.run(context)
-                results[module.metadata.name] = {
-                    'success': True,
-                    'data': result
-                }
-                
-                print(f"✅ Module '{module.metadata.name}' completed successfully")
-                
+                module.cleanup()
             except Exception as e:
-                print(f"❌ Error in module '{module.metadata.name}': {e}")
-                import traceback
-                traceback.print_exc()
-                results[module.metadata.name] = {
-                    'success': False,
-                    'error': str(e)
-                }
-            
-            finally:
-                try:
-                    module.cleanup()
-                except Exception as e:
-                    print(f"⚠️  Cleanup error in module '{module.metadata.name}': {e}")
+                print(f"⚠️  Cleanup error in module '{module.metadata.name}': {e}")
+    
+    async def run_modules(self, context: CrawlContext) -> Dict[str, Any]:
+        modules = [module for module in self.loaded_modules if module.enabled]
+        
+        # modules only read the context, so they can run side by side
+        outcomes = await asyncio.gather(
+            *(self._run_one(module, context) for module in modules),
+            return_exceptions=True
+        )
+        
+        results = {}
+        for module, outcome in zip(modules, outcomes):
+            if isinstance(outcome, BaseException):
+                outcome = {'success': False, 'error': str(outcome)}
+            if outcome is not None:
+                results[module.metadata.name] = outcome
         
         return results
     
@@ -197,7 +205,6 @@ class ModuleManager:
             
         except Exception as e:
             print(f"❌ Error in module '{module_name}': {e}")
-            import traceback
             traceback.print_exc()
             return {'success': False, 'error': str(e)}
         
@@ -5,12 +5,65 @@ Extracts paths, parameters, and filenames for fuzzing/pentesting
 This is my first shot at making a somewhat functional module for OctoCrawl.
 """
 
-from typing import Dict, Any, Set
-from urllib.parse import urlparse, parse_qs
+from typing import Dict, Any
+from urllib.parse import unquote_plus
 
 from .example import BaseModule, ModuleMetadata, CrawlContext
 
 
+# category bits, a word can belong to several wordlists at once
+PATHS, PARAMETERS, FILENAMES, EXTENSIONS, DIRECTORIES = 1, 2, 4, 8, 16
+CATEGORIES = (
+    ('paths', PATHS),
+    ('parameters', PARAMETERS),
+    ('filenames', FILENAMES),
+    ('extensions', EXTENSIONS),
+    ('directories', DIRECTORIES),
+)
+
+
+def _extract(url: str, words: Dict[str, int]) -> None:
+    """Splits one URL into path parts and query parameter names without urlparse"""
+    get = words.get
+    scheme_end = url.find('://')
+    path_start = url.find('/', scheme_end + 3 if scheme_end != -1 else 0)
+
+    fragment_start = url.find('#')
+    if fragment_start != -1:
+        url = url[:fragment_start]
+
+    query_start = url.find('?')
+    if query_start != -1:
+        query = url[query_start + 1:]
+        url = url[:query_start]
+    else:
+        query = ''
+
+    if path_start != -1 and path_start < len(url):
+        for part in url[path_start:].split('/'):
+            # ";params" like jsessionid are session noise, not part of the name
+            part = part.partition(';')[0]
+            if not part:
+                continue
+            dot = part.rfind('.')
+            if dot != -1:
+                words[part] = get(part, 0) | PATHS | FILENAMES
+                ext = part[dot + 1:]
+                words[ext] = get(ext, 0) | EXTENSIONS
+            else:
+                words[part] = get(part, 0) | PATHS | DIRECTORIES
+
+    if query:
+        for segment in query.split('&'):
+            eq = segment.find('=')
+            name = segment[:eq] if eq != -1 else segment
+            # only pay for percent-decoding when the key is actually encoded
+            if '%' in name or '+' in name:
+                name = unquote_plus(name)
+            if name:
+                words[name] = get(name, 0) | PARAMETERS
+
+
 class WordlistModule(BaseModule):
     """
     Generates wordlists for fuzzing and pentesting
@@ -31,57 +84,31 @@ class WordlistModule(BaseModule):
         
         self.log("Extracting wordlists...", "INFO")
         
-        paths: Set[str] = set()
-        parameters: Set[str] = set()
-        filenames: Set[str] = set()
-        extensions: Set[str] = set()
-        directories: Set[str] = set()
-        
-        for url in context.gathered_urls.keys():
-            parsed = urlparse(url)
-            
-            path_parts = [p for p in parsed.path.split('/') if p]
-            for part in path_parts:
-                if '.' in part:
-                    filenames.add(part)
-                    ext = part.split('.')[-1]
-                    extensions.add(ext)
-                else:
-                    directories.add(part)
-                
-                paths.add(part)
-            
-            if parsed.query:
-                params = parse_qs(parsed.query)
-                for param_name in params.keys():
-                    parameters.add(param_name)
+        # word -> category bits, sorted once and sliced per category
+        words: Dict[str, int] = {}
+        for url in context.gathered_urls:
+            _extract(url, words)
         
+        all_sorted = sorted(words)
         wordlists = {
-            'paths': sorted(paths),
-            'parameters': sorted(parameters),
-            'filenames': sorted(filenames),
-            'extensions': sorted(extensions),
-            'directories': sorted(directories)
+            name: [w for w in all_sorted if words[w] & mask]
+            for name, mask in CATEGORIES
         }
         
         output_files = {}
         
-        for name, words in wordlists.items():
-            if words:
-                content = '\n'.join(words)
+        for name, entries in wordlists.items():
+            if entries:
+                content = '\n'.join(entries)
                 file = self.save_output(
                     f"wordlist_{name}.txt",
                     content
                 )
                 output_files[name] = str(file)
 
-        all_words = set()
-        for words in wordlists.values():
-            all_words.update(words)
-
         combined_file = self.save_output(
             "wordlist_combined.txt",
-            '\n'.join(sorted(all_words))
+            '\n'.join(all_sorted)
         )
         output_files['combined'] = str(combined_file)
 
@@ -92,10 +119,10 @@ class WordlistModule(BaseModule):
         )
         
         self.log(f"Generated {len(output_files)} wordlist files", "INFO")
-        self.log(f"Total unique words: {len(all_words)}", "INFO")
+        self.log(f"Total unique words: {len(words)}", "INFO")
         
         return {
-            'total_words': len(all_words),
+            'total_words': len(words),
             'breakdown': {k: len(v) for k, v in wordlists.items()},
             'output_files': output_files,
             'report_file': str(report_file)
@@ -104,7 +131,7 @@ class WordlistModule(BaseModule):
     def _generate_report(self, context: CrawlContext, wordlists: Dict[str, list]) -> str:
         """Generates a markdown report"""
         
-        report = f"""# Wordlist Generation Report
+        parts = [f"""# Wordlist Generation Report
 
 **Target:** {context.start_url}  
 **Domain:** {context.base_domain}
@@ -113,30 +140,30 @@ class WordlistModule(BaseModule):
 
 ## Statistics
 
-"""
+"""]
         
         for name, words in wordlists.items():
-            report += f"- **{name.capitalize()}**: {len(words)} unique entries\n"
+            parts.append(f"- **{name.capitalize()}**: {len(words)} unique entries\n")
         
-        report += """
+        parts.append("""
 
 ---
 
 ## Sample Entries
 
-"""
+""")
         
         for name, words in wordlists.items():
             if words:
-                report += f"\n### {name.capitalize()}\n\n"
-                sample = sorted(words)[:20]
-                for word in sample:
-                    report += f"- `{word}`\n"
+                parts.append(f"\n### {name.capitalize()}\n\n")
+                # the lists come out of run() already sorted
+                sample = words[:20]
+                parts.extend(f"- `{word}`\n" for word in sample)
                 
                 if len(words) > 20:
-                    report += f"\n*...and {len(words) - 20} more (see {name} wordlist file)*\n"
+                    parts.append(f"\n*...and {len(words) - 20} more (see {name} wordlist file)*\n")
         
-        report += """
+        parts.append("""
 
 ---
 
@@ -158,6 +185,6 @@ gobuster dir -u https://target.com -w wordlist_directories.txt
 wfuzz -u https://target.com/FUZZ -w wordlist_combined.txt
 ```
 
-"""
+""")
         
-        return report
\ No newline at end of file
+        return ''.join(parts)
\ No newline at end of file
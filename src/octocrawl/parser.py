@@ -1,26 +1,202 @@
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin
+import functools
 import bs4
 import re
 import json
+import string
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+try:
+    import lxml.etree
+    import lxml.html
+    # bytes + explicit encoding: lxml refuses str input carrying an XML encoding declaration
+    _LXML_HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+except ImportError:
+    lxml = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import hyperscan
+    # no capture groups in hyperscan: match the whole url(...) and trim it afterwards
+    _CSS_URL_DB = hyperscan.Database()
+    _CSS_URL_DB.compile(
+        expressions=[rb'url\(\s*["\']?[^"\')]+["\']?\s*\)'],
+        ids=[1],
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST]
+    )
+    # pages are parsed one at a time in each ProcessPoolExecutor worker (see crawler),
+    # so every process gets its own copy of this scratch space and never shares it
+    _CSS_URL_SCRATCH = hyperscan.Scratch(_CSS_URL_DB)
+except ImportError:
+    hyperscan = None
+    _CSS_URL_DB = None
+
+# lxml is a dependency, but keep working on installs where it failed to build
+DEFAULT_PARSER = 'lxml' if lxml is not None else 'html.parser'
+
+
+# scheme://netloc prefix, one C-level match instead of a full urlparse()
+_NETLOC_RE = re.compile(r'^[a-z][a-z0-9+\-.]*://([^/?#]*)', re.IGNORECASE)
+
+# sitemap <loc> entries, surrounding whitespace left out of the group
+_LOC_RE = re.compile(r'<loc>\s*([^<]+?)\s*</loc>', re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=65536)
+def cached_urljoin(base, path):
+    # the same (page, href) pairs come back constantly: nav bars, '/', '../'
+    return urljoin(base, path)
+
+
+def _netloc(url):
+    match = _NETLOC_RE.match(url)
+    return match.group(1).lower() if match else ''
+
+
+def resolve_parser(parser):
+    return 'html.parser' if parser == 'lxml' and lxml is None else parser
+
+
+def lxml_document(content):
+    try:
+        return lxml.html.document_fromstring(content.encode('utf-8', 'replace'), parser=_LXML_HTML_PARSER)
+    except lxml.etree.ParserError:
+        # whitespace-only or otherwise empty document
+        return None
+
+
+def _parse_document(content, parser):
+    # returns (soup, tree, root), only the one matching the engine is set
+    parser = resolve_parser(parser)
+    if parser == 'selectolax':
+        return None, HTMLParser(content), None
+    if parser == 'lxml':
+        root = lxml_document(content)
+        # an empty document still needs a root for the parsers to walk
+        return None, None, root if root is not None else lxml.html.Element('html')
+    try:
+        return bs4.BeautifulSoup(content, parser), None, None
+    except bs4.FeatureNotFound:
+        return bs4.BeautifulSoup(content, 'html.parser'), None, None
+
+
+def _hyperscan_css_urls(text):
+    data = text.encode('utf-8', 'replace')
+    spans = []
+    _CSS_URL_DB.scan(
+        data,
+        match_event_handler=lambda _id, start, end, _flags, _context: spans.append((start, end)),
+        scratch=_CSS_URL_SCRATCH
+    )
+    # drop the leading 'url(' and trailing ')', then whitespace and quotes
+    return [data[start + 4:end - 1].decode('utf-8', 'replace').strip().strip('"\'') for start, end in spans]
+
+
+# lowercases A-Z only, so offsets in the result still line up with the original text
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def _scan_css_urls(text):
+    # linear scan for url(...) references, no regex backtracking on large stylesheets
+    haystack = text.lower() if text.isascii() else text.translate(_ASCII_LOWER)
+    length = len(text)
+    urls = []
+
+    position = haystack.find('url(')
+    while position != -1:
+        start = position + 4
+        while start < length and text[start] in ' \t\r\n\f':
+            start += 1
+
+        quote = text[start] if start < length and text[start] in '"\'' else ''
+        if quote:
+            start += 1
+            end = text.find(quote, start)
+        else:
+            end = text.find(')', start)
+        if end == -1:
+            break
+
+        url = text[start:end].strip()
+        if url:
+            urls.append(url)
+        position = haystack.find('url(', end + 1)
+
+    return urls
 
-def search_text_for_keywords(text, keywords):
+
+def build_keyword_matcher(keywords):
+    # built once per crawl, keywords are lowercased here rather than on every page
+    if not keywords:
+        return None
+    
+    # lowercased keyword -> every original spelling, "Token" and "token" are both reported
+    grouped = {}
+    for keyword in keywords:
+        grouped.setdefault(keyword.lower(), {})[keyword] = None
+    
+    if ahocorasick is None:
+        return {keyword_lower: tuple(originals) for keyword_lower, originals in grouped.items()}
+    
+    # the automaton finds every keyword in a single pass over the page text
+    automaton = ahocorasick.Automaton()
+    for keyword_lower, originals in grouped.items():
+        automaton.add_word(keyword_lower, (keyword_lower, tuple(originals)))
+    automaton.make_automaton()
+    return automaton
+
+
+def search_text_for_keywords(text, keywords, already_lower=False):
     found_keywords = {}
     if not keywords or not text:
         return found_keywords
     
-    text_lower = text.lower()
+    # a plain list of keywords still works, build_keyword_matcher() just saves redoing this per page
+    is_automaton = ahocorasick is not None and isinstance(keywords, ahocorasick.Automaton)
+    if not is_automaton and not isinstance(keywords, dict):
+        keywords = build_keyword_matcher(keywords)
+        is_automaton = ahocorasick is not None and isinstance(keywords, ahocorasick.Automaton)
     
-    for keyword in keywords:
-        count = text_lower.count(keyword.lower())
+    # parsers pass their cached lowercased text so repeated searches skip the copy
+    text_lower = text if already_lower else text.lower()
+    
+    if is_automaton:
+        # the automaton reports overlapping hits, keep only those str.count() would see
+        counts = {}
+        next_start = {}
+        for end, (keyword_lower, _) in keywords.iter(text_lower):
+            start = end - len(keyword_lower) + 1
+            if start >= next_start.get(keyword_lower, 0):
+                counts[keyword_lower] = counts.get(keyword_lower, 0) + 1
+                next_start[keyword_lower] = end + 1
+        for keyword_lower, count in counts.items():
+            for keyword in keywords.get(keyword_lower)[1]:
+                found_keywords[keyword] = count
+        return found_keywords
+    
+    for keyword_lower, originals in keywords.items():
+        count = text_lower.count(keyword_lower)
         if count > 0:
-            found_keywords[keyword] = count
+            for keyword in originals:
+                found_keywords[keyword] = count
     
     return found_keywords
 
 
-class html_parser:
-    URL_IN_TEXT_PATTERN = re.compile(r'url\((["\']?)(.*?)\1\)', re.IGNORECASE)
+def _cdata_text(comment):
+    # "[CDATA[text]]", how lxml and selectolax keep a CDATA section found in HTML
+    return comment[7:].removesuffix(']]')
+
 
+class html_parser:
     LINK_ATTR_BY_TAG = {
         'a': 'href',
         'img': 'src',
@@ -33,18 +209,105 @@ class html_parser:
         'form': 'action'
     }
 
-    def __init__(self, content, base_url, soup=None, parser='html.parser'):
-        self.soup = soup if soup is not None else bs4.BeautifulSoup(content, parser)
+    # bs4 gives strings under these tags their own classes, which get_text() leaves out
+    TEXTLESS_TAGS = ['script', 'style', 'template', 'rt', 'rp']
+
+    # selectolax matches the same tags in C instead of walking the bs4 tree
+    LINK_SELECTOR = ', '.join(f'{tag}[{attr}]' for tag, attr in LINK_ATTR_BY_TAG.items())
+
+    # compiled once, lxml evaluates each union in C in a single call
+    if lxml is not None:
+        # plain strings: lxml's smart strings keep their whole tree alive, e.g. in cached_urljoin
+        LINK_XPATH = lxml.etree.XPath(
+            ' | '.join(f'//{tag}/@{attr}' for tag, attr in LINK_ATTR_BY_TAG.items()),
+            smart_strings=False
+        )
+        STYLE_XPATH = lxml.etree.XPath('//style/text() | //@style', smart_strings=False)
+        # the text bs4's get_text() counts: nothing under the tags it gives their own string
+        # class, plus CDATA sections, which lxml's HTML parser keeps as "[CDATA[...]]" comments
+        _OUTSIDE_SKIPPED = ' or '.join(f'ancestor::{tag}' for tag in TEXTLESS_TAGS)
+        TEXT_XPATH = lxml.etree.XPath(
+            f'//text()[not({_OUTSIDE_SKIPPED})] | //comment()[starts-with(., "[CDATA[")][not({_OUTSIDE_SKIPPED})]',
+            smart_strings=False
+        )
+
+    def __init__(self, content, base_url, soup=None, parser=DEFAULT_PARSER, tree=None, root=None):
+        # one document per page: a bs4 `soup`, a selectolax `tree` or an lxml `root`
+        if soup is None and tree is None and root is None:
+            soup, tree, root = _parse_document(content, parser)
+        self.soup, self.tree, self.root = soup, tree, root
+        self.content = content
         self.base_url = base_url
-        self.base_domain = urlparse(base_url).netloc
+        self.base_domain = _netloc(base_url)
+        # "scheme://netloc" exactly as urljoin would write it for a same-origin link
+        origin = _NETLOC_RE.match(base_url)
+        self._origin_prefix = origin.group(0) if origin else None
 
         self._links_cache = None
         self._text_cache = None
+        self._text_lower = None
 
     def find_keywords(self, keywords):
-        if self._text_cache is None:
-            self._text_cache = self.soup.get_text()
-        return search_text_for_keywords(self._text_cache, keywords)
+        if self._text_lower is None and keywords:
+            if self._text_cache is None:
+                if self.tree is not None:
+                    self._text_cache = self._selectolax_text()
+                elif self.root is not None:
+                    self._text_cache = ''.join(
+                        node if isinstance(node, str) else _cdata_text(node.text)
+                        for node in self.TEXT_XPATH(self.root)
+                    )
+                else:
+                    self._walk_soup()
+            self._text_lower = self._text_cache.lower()
+        return search_text_for_keywords(self._text_lower, keywords, already_lower=True)
+
+    def _selectolax_text(self):
+        # the same text as bs4's get_text(), see TEXT_XPATH. Collect the links first:
+        # the tree is edited in place and <style> bodies feed internal_links
+        self.internal_links
+        if '<![CDATA[' in self.content:
+            comments = [node for node in self.tree.root.traverse() if node.tag == '_comment']
+            for node in comments:
+                comment = node.html[4:-3]
+                if comment.startswith('[CDATA['):
+                    node.replace_with(_cdata_text(comment))
+        self.tree.strip_tags(self.TEXTLESS_TAGS)
+        root = self.tree.root
+        return root.text() if root is not None else ''
+
+    def _walk_soup(self):
+        # one pass over the bs4 tree fills both the links and the text caches
+        # dict keys: ordered dedup, repeated hrefs skip the URL handling entirely
+        all_links = {}
+        seen_hrefs = set()
+        text_parts = []
+
+        for node in self.soup.descendants:
+            node_type = type(node)
+            # the same strings get_text() keeps: no comments, <script> or <style> bodies
+            if node_type is bs4.NavigableString or node_type is bs4.CData:
+                text_parts.append(node)
+                continue
+            if node_type is not bs4.Tag:
+                continue
+
+            attribute = self.LINK_ATTR_BY_TAG.get(node.name)
+            if attribute:
+                link_path = node.get(attribute)
+                if link_path not in seen_hrefs:
+                    seen_hrefs.add(link_path)
+                    self._add_attr_link(all_links, link_path)
+
+            style_attr = node.get('style')
+            if style_attr:
+                self._add_style_links(all_links, style_attr)
+
+            if node.name == 'style' and node.string:
+                self._add_style_links(all_links, node.string)
+
+        self._links_cache = list(all_links)
+        self._text_cache = ''.join(text_parts)
 
     def _add_attr_link(self, all_links, link_path):
         if not link_path:
@@ -57,57 +320,85 @@ class html_parser:
         if ';base64,' in link_lower or ',base64,' in link_lower:
             return
 
-        try:
-            absolute_link = urljoin(self.base_url, link_path)
-            parsed = urlparse(absolute_link)
-
-            if parsed.netloc == self.base_domain:
-                all_links.add(parsed._replace(fragment='').geturl())
-        except Exception:
-            pass
+        self._add_link(all_links, link_path)
 
     def _add_style_links(self, all_links, style_content):
         if not style_content:
             return
 
-        for _, url in self.URL_IN_TEXT_PATTERN.findall(style_content):
-            try:
-                absolute_link = urljoin(self.base_url, url.strip())
-                if urlparse(absolute_link).netloc == self.base_domain:
-                    all_links.add(urlparse(absolute_link)._replace(fragment='').geturl())
-            except Exception:
-                continue
+        if _CSS_URL_DB is not None:
+            urls = _hyperscan_css_urls(style_content)
+        else:
+            urls = _scan_css_urls(style_content)
+
+        for url in dict.fromkeys(urls):
+            self._add_link(all_links, url.strip())
+
+    def _add_link(self, all_links, link_path):
+        prefix = self._origin_prefix
+        clean_link = link_path.split('#', 1)[0]
+        # root-relative paths and same-origin absolute URLs need no urljoin, unless
+        # they carry dot segments, an empty query or characters urljoin would rewrite
+        if prefix and '/.' not in clean_link and clean_link[-1:] != '?' and clean_link.isprintable():
+            if clean_link[:1] == '/' and clean_link[1:2] != '/':
+                all_links[prefix + clean_link] = None
+                return
+            if clean_link.startswith(prefix) and clean_link[len(prefix):len(prefix) + 1] in ('', '/', '?'):
+                all_links[clean_link] = None
+                return
+
+        try:
+            absolute_link = cached_urljoin(self.base_url, link_path)
+            if _netloc(absolute_link) == self.base_domain:
+                all_links[absolute_link.split('#', 1)[0]] = None
+        except Exception:
+            pass
 
     @property
     def internal_links(self):
         if self._links_cache is not None:
             return self._links_cache
 
-        all_links = set()
-
-        # one walk over the tree instead of a separate find_all() per tag type
-        for tag in self.soup.find_all(True):
-            attribute = self.LINK_ATTR_BY_TAG.get(tag.name)
-            if attribute:
-                self._add_attr_link(all_links, tag.get(attribute))
+        all_links = {}
+
+        if self.tree is not None:
+            hrefs = (node.attributes.get(self.LINK_ATTR_BY_TAG[node.tag]) for node in self.tree.css(self.LINK_SELECTOR))
+            for link in dict.fromkeys(hrefs):
+                self._add_attr_link(all_links, link)
+            # <style> blocks and style="" attributes from one query, scanned as one string
+            styles = []
+            for node in self.tree.css('style, [style]'):
+                if node.tag == 'style':
+                    styles.append(node.text())
+                style_attr = node.attributes.get('style')
+                if style_attr:
+                    styles.append(style_attr)
+            self._add_style_links(all_links, '\n'.join(styles))
+
+            self._links_cache = list(all_links)
+            return self._links_cache
 
-            style_attr = tag.get('style')
-            if style_attr:
-                self._add_style_links(all_links, style_attr)
+        if self.root is not None:
+            for link in dict.fromkeys(self.LINK_XPATH(self.root)):
+                self._add_attr_link(all_links, link)
+            # <style> blocks and style="" attributes scanned as one string
+            self._add_style_links(all_links, '\n'.join(self.STYLE_XPATH(self.root)))
 
-            if tag.name == 'style' and tag.string:
-                self._add_style_links(all_links, tag.string)
+            self._links_cache = list(all_links)
+            return self._links_cache
 
-        self._links_cache = list(all_links)
+        self._walk_soup()
         return self._links_cache
 
 
 class json_parser:
     LINK_KEYS = {'href', 'url', 'src', 'link', 'guid', 'uri', 'path', 'location'}
+    # quotes, brackets and blanks left around a URL by malformed input
+    STRIP_CHARS = '",\'\\() \t\n\r'
 
     def __init__(self, content, base_url):
         self.base_url = base_url
-        self.base_domain = urlparse(base_url).netloc
+        self.base_domain = _netloc(base_url)
         self.raw_content = content
         
         try:
@@ -116,30 +407,38 @@ class json_parser:
             self.data = {}
         
         self._links_cache = None
+        self._text_lower = None
 
     def find_keywords(self, keywords):
-        return search_text_for_keywords(self.raw_content, keywords)
-
-    def _find_urls_recursive(self, data_structure, depth=0, max_depth=10):
-        if depth > max_depth:
-            return set()
-        
-        found_urls = set()
-        
-        if isinstance(data_structure, dict):
-            for key, value in data_structure.items():
-                if key in self.LINK_KEYS and isinstance(value, str):
-                    found_urls.add(value)
-                elif isinstance(value, (dict, list)):
-                    found_urls.update(self._find_urls_recursive(value, depth + 1, max_depth))
+        if self._text_lower is None and keywords:
+            self._text_lower = self.raw_content.lower()
+        return search_text_for_keywords(self._text_lower, keywords, already_lower=True)
+
+    def _find_urls(self, data, max_depth=10):
+        # explicit stack instead of one recursive call per dict/list
+        found_urls = {}
+        stack = [(data, 0)]
         
-        elif isinstance(data_structure, list):
-            for item in data_structure:
-                if isinstance(item, (dict, list)):
-                    found_urls.update(self._find_urls_recursive(item, depth + 1, max_depth))
-                elif isinstance(item, str):
-                    if item.startswith(('http://', 'https://', '/', './')):
-                        found_urls.add(item)
+        while stack:
+            node, depth = stack.pop()
+            if depth > max_depth:
+                continue
+            
+            if isinstance(node, dict):
+                for key, value in node.items():
+                    if isinstance(value, str):
+                        if key in self.LINK_KEYS:
+                            found_urls[value] = None
+                    elif isinstance(value, (dict, list)):
+                        stack.append((value, depth + 1))
+            
+            elif isinstance(node, list):
+                for item in node:
+                    if isinstance(item, str):
+                        if item.startswith(('http://', 'https://', '/', './')):
+                            found_urls[item] = None
+                    elif isinstance(item, (dict, list)):
+                        stack.append((item, depth + 1))
         
         return found_urls
 
@@ -152,21 +451,23 @@ class json_parser:
             self._links_cache = []
             return self._links_cache
 
-        discovered_urls = self._find_urls_recursive(self.data)
-        internal_links = set()
+        discovered_urls = self._find_urls(self.data)
+        internal_links = {}
 
+        strip_chars = self.STRIP_CHARS
         for link in discovered_urls:
-            clean_link = link.strip('",\'\\() \t\n\r')
-            if not clean_link:
-                continue
+            # decoded JSON strings are almost always clean already, only strip when an end needs it
+            if link and link[0] not in strip_chars and link[-1] not in strip_chars:
+                clean_link = link
+            else:
+                clean_link = link.strip(strip_chars)
+                if not clean_link:
+                    continue
 
             try:
-                absolute_link = urljoin(self.base_url, clean_link)
-                parsed = urlparse(absolute_link)
-                
-                if parsed.netloc == self.base_domain:
-                    clean_url = parsed._replace(fragment='')
-                    internal_links.add(clean_url.geturl())
+                absolute_link = cached_urljoin(self.base_url, clean_link)
+                if _netloc(absolute_link) == self.base_domain:
+                    internal_links[absolute_link.split('#', 1)[0]] = None
             except Exception:
                 continue
         
@@ -175,38 +476,50 @@ class json_parser:
 
 
 class dir_listing_parser:
-    def __init__(self, content, base_url, soup=None, parser='html.parser'):
-        self.soup = soup if soup is not None else bs4.BeautifulSoup(content, parser)
+    # a listing only needs its hrefs, lxml hands them over in one C-level call
+    if lxml is not None:
+        HREF_XPATH = lxml.etree.XPath('//a/@href', smart_strings=False)
+
+    def __init__(self, content, base_url, soup=None, parser=DEFAULT_PARSER, tree=None, root=None):
+        if soup is None and tree is None and root is None:
+            # no document to reuse: lxml is the cheapest way to the hrefs whatever the engine
+            soup, tree, root = _parse_document(content, 'lxml' if lxml is not None else parser)
+        self.soup, self.tree, self.root = soup, tree, root
         self.base_url = base_url
-        self.base_domain = urlparse(base_url).netloc
+        self.base_domain = _netloc(base_url)
         self.raw_content = content
         
         self._links_cache = None
+        self._text_lower = None
 
     def find_keywords(self, keywords):
-        return search_text_for_keywords(self.raw_content, keywords)
+        if self._text_lower is None and keywords:
+            self._text_lower = self.raw_content.lower()
+        return search_text_for_keywords(self._text_lower, keywords, already_lower=True)
 
     @property
     def internal_links(self):
         if self._links_cache is not None:
             return self._links_cache
         
-        links = set()
+        links = {}
         ignored_hrefs = {'/', '../', '?C=N;O=D', '?C=M;O=A', '?C=S;O=A', '?C=D;O=A'}
 
-        for tag in self.soup.find_all('a', href=True):
-            href = tag['href']
-            
+        if self.tree is not None:
+            hrefs = (node.attributes.get('href') for node in self.tree.css('a[href]'))
+        elif self.root is not None:
+            hrefs = self.HREF_XPATH(self.root)
+        else:
+            hrefs = (tag['href'] for tag in self.soup.find_all('a', href=True))
+
+        for href in dict.fromkeys(hrefs):
             if not href or href.startswith('?') or href in ignored_hrefs:
                 continue
             
             try:
-                absolute_link = urljoin(self.base_url, href)
-                parsed = urlparse(absolute_link)
-                
-                if parsed.netloc == self.base_domain:
-                    clean_url = parsed._replace(fragment='')
-                    links.add(clean_url.geturl())
+                absolute_link = cached_urljoin(self.base_url, href)
+                if _netloc(absolute_link) == self.base_domain:
+                    links[absolute_link.split('#', 1)[0]] = None
             except Exception:
                 continue
         
@@ -218,25 +531,26 @@ class xml_parser:
     def __init__(self, content, base_url):
         self.content = content
         self.base_url = base_url
-        self.base_domain = urlparse(base_url).netloc
+        self.base_domain = _netloc(base_url)
         self._links_cache = None
+        self._text_lower = None
     
     def find_keywords(self, keywords):
-        return search_text_for_keywords(self.content, keywords)
+        if self._text_lower is None and keywords:
+            self._text_lower = self.content.lower()
+        return search_text_for_keywords(self._text_lower, keywords, already_lower=True)
     
     @property
     def internal_links(self):
         if self._links_cache is not None:
             return self._links_cache
         
-        url_pattern = re.compile(r'<loc>(.*?)</loc>', re.IGNORECASE)
-        links = set()
+        links = {}
         
-        for match in url_pattern.findall(self.content):
-            url = match.strip()
+        for url in _LOC_RE.findall(self.content):
             try:
-                if urlparse(url).netloc == self.base_domain:
-                    links.add(url)
+                if _netloc(url) == self.base_domain:
+                    links[url] = None
             except Exception:
                 continue
         
@@ -1,8 +1,33 @@
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 from octocrawl.ui import gradient_text
+from octocrawl.parser import cached_urljoin
+import asyncio
+import io
 import re
 import xml.etree.ElementTree as ET
 
+try:
+    import lxml.etree
+except ImportError:
+    lxml = None
+
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+_SITEMAP_TAG = f'{{{SITEMAP_NS}}}sitemap'
+_URL_TAG = f'{{{SITEMAP_NS}}}url'
+_LOC_TAG = f'{{{SITEMAP_NS}}}loc'
+
+# one "Directive: value" line, leading blanks and inline comments left out; the value
+# is greedy and trimmed in Python, a lazy one backtracks quadratically on runs of blanks
+_ROBOTS_LINE = re.compile(r'^[ \t]*([A-Za-z-]+)[ \t]*:[ \t]*([^\r\n#]*)(?:#[^\r\n]*)?\r?$', re.MULTILINE)
+
+# sitemap indexes are attacker-controlled: cap how deep they nest and how many
+# sub-sitemaps are fetched at once
+MAX_SITEMAP_DEPTH = 5
+SITEMAP_CONCURRENCY = 8
+
+# fallback for sitemaps that are not valid XML; [^<] cannot run past the closing tag
+_LOC_RE = re.compile(r'<loc>\s*([^<]+?)\s*</loc>', re.IGNORECASE)
+
 async def check_robots_txt(base_url, http_request_func, print_lock=None, custom_agent=None):
     result = {
         'disallowed_paths': [],
@@ -11,7 +36,7 @@ async def check_robots_txt(base_url, http_request_func, print_lock=None, custom_
         'crawl_delay': None
     }
     
-    robots_url = urljoin(base_url, '/robots.txt')
+    robots_url = cached_urljoin(base_url, '/robots.txt')
     
     try:
         response = await http_request_func(robots_url, timeout=10, custom_agent=custom_agent)
@@ -28,35 +53,28 @@ async def check_robots_txt(base_url, http_request_func, print_lock=None, custom_
             async with print_lock:
                 print(gradient_text(f"🪽  Found robots.txt, let's parse !"))
         
-        for line in content.split('\n'):
-            line = line.strip()
+        for match in _ROBOTS_LINE.finditer(content):
+            directive = match.group(1).lower()
+            value = match.group(2).rstrip()
             
-            if not line or line.startswith('#'):
-                continue
+            if directive == 'disallow' and value:
+                if value.startswith('/'):
+                    full_url = cached_urljoin(base_url, value.rstrip('*'))
+                    result['disallowed_paths'].append(full_url)
+            
+            elif directive == 'allow' and value:
+                if value.startswith('/'):
+                    full_url = cached_urljoin(base_url, value.rstrip('*'))
+                    result['allowed_paths'].append(full_url)
+            
+            elif directive == 'sitemap':
+                result['sitemaps'].append(value)
             
-            if ':' in line:
-                directive, value = line.split(':', 1)
-                directive = directive.strip().lower()
-                value = value.strip()
-                
-                if directive == 'disallow' and value:
-                    if value.startswith('/'):
-                        full_url = urljoin(base_url, value.rstrip('*'))
-                        result['disallowed_paths'].append(full_url)
-                
-                elif directive == 'allow' and value:
-                    if value.startswith('/'):
-                        full_url = urljoin(base_url, value.rstrip('*'))
-                        result['allowed_paths'].append(full_url)
-                
-                elif directive == 'sitemap':
-                    result['sitemaps'].append(value)
-                
-                elif directive == 'crawl-delay':
-                    try:
-                        result['crawl_delay'] = float(value)
-                    except ValueError:
-                        pass
+            elif directive == 'crawl-delay':
+                try:
+                    result['crawl_delay'] = float(value)
+                except ValueError:
+                    pass
         
         if print_lock:
             async with print_lock:
@@ -78,11 +96,60 @@ async def check_robots_txt(base_url, http_request_func, print_lock=None, custom_
         return result
 
 
+def _parse_sitemap_locations(content):
+    # returns (sub_sitemaps, page_urls), only namespaced <sitemap>/<url> entries count
+    sub_sitemaps, page_urls = [], []
+
+    if lxml is None:
+        root = ET.fromstring(content)
+        for sitemap_tag in root.iter(_SITEMAP_TAG):
+            loc = sitemap_tag.findtext(_LOC_TAG)
+            if loc:
+                sub_sitemaps.append(loc.strip())
+        if not sub_sitemaps:
+            for url_tag in root.iter(_URL_TAG):
+                loc = url_tag.findtext(_LOC_TAG)
+                if loc:
+                    page_urls.append(loc.strip())
+        return sub_sitemaps, page_urls
+
+    # streamed: each entry is dropped once read, so a 50k URL sitemap never sits in memory as a tree.
+    # The sitemap comes from the target site: no entity expansion and no network access,
+    # whatever the installed lxml defaults to (before 5.0 entities were resolved)
+    entries = lxml.etree.iterparse(
+        io.BytesIO(content.encode('utf-8')),
+        tag=(_SITEMAP_TAG, _URL_TAG),
+        encoding='utf-8',
+        recover=True,
+        resolve_entities=False,
+        no_network=True
+    )
+    for _, element in entries:
+        loc = element.findtext(_LOC_TAG)
+        if loc:
+            (sub_sitemaps if element.tag == _SITEMAP_TAG else page_urls).append(loc.strip())
+        element.clear()
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+
+    return sub_sitemaps, page_urls
+
+
 async def check_sitemap_xml(sitemap_url, http_request_func, print_lock=None, base_domain=None, custom_agent=None):
+    # seen: every sitemap already fetched or queued, so a self-referencing index is read once
+    return await _check_sitemap_xml(
+        sitemap_url, http_request_func, print_lock, base_domain, custom_agent,
+        seen={sitemap_url}, depth=0, semaphore=asyncio.Semaphore(SITEMAP_CONCURRENCY)
+    )
+
+
+async def _check_sitemap_xml(sitemap_url, http_request_func, print_lock, base_domain, custom_agent, seen, depth, semaphore):
     urls = []
     
     try:
-        response = await http_request_func(sitemap_url, timeout=10, custom_agent=custom_agent)
+        # only the fetch holds the semaphore, an index waiting on its children must not block them
+        async with semaphore:
+            response = await http_request_func(sitemap_url, timeout=10, custom_agent=custom_agent)
         
         if not response['done'] or response['response_code'] != 200:
             if print_lock:
@@ -97,60 +164,62 @@ async def check_sitemap_xml(sitemap_url, http_request_func, print_lock=None, bas
                 print(gradient_text(f"🧭 Found sitemap at {sitemap_url}, parsing..."))
         
         try:
-            root = ET.fromstring(content)
-            
-            namespaces = {
-                'sm': 'http://www.sitemaps.org/schemas/sitemap/0.9',
-                'image': 'http://www.google.com/schemas/sitemap-image/1.1',
-                'video': 'http://www.google.com/schemas/sitemap-video/1.1'
-            }
+            sub_sitemaps, page_urls = _parse_sitemap_locations(content)
+        except SyntaxError:
+            # ET.ParseError and lxml's XMLSyntaxError both derive from SyntaxError
+            sub_sitemaps, page_urls = None, None
+            if print_lock:
+                async with print_lock:
+                    print(gradient_text(f"🏴‍☠️ XML parsing failed, trying regex extraction..."))
+        
+        if sub_sitemaps:
+            if print_lock:
+                async with print_lock:
+                    print(gradient_text(f"    🌊 Sitemap index detected, found {len(sub_sitemaps)} sub-sitemaps"))
             
-            sitemap_tags = root.findall('.//sm:sitemap', namespaces)
-            if sitemap_tags:
+            new_sitemaps = [loc for loc in dict.fromkeys(sub_sitemaps) if loc not in seen]
+            seen.update(new_sitemaps)
+            if depth >= MAX_SITEMAP_DEPTH:
+                new_sitemaps = []
                 if print_lock:
                     async with print_lock:
-                        print(gradient_text(f"    🌊 Sitemap index detected, found {len(sitemap_tags)} sub-sitemaps"))
-                
-                for sitemap_tag in sitemap_tags:
-                    loc = sitemap_tag.find('sm:loc', namespaces)
-                    if loc is not None and loc.text:
-                        sub_urls = await check_sitemap_xml(
-                            loc.text, 
-                            http_request_func, 
-                            print_lock, 
-                            base_domain,
-                            custom_agent
-                        )
-                        urls.extend(sub_urls)
+                        print(gradient_text(f"    🌊 Sitemap indexes nested more than {MAX_SITEMAP_DEPTH} deep, not following"))
             
-            else:
-                url_tags = root.findall('.//sm:url', namespaces)
-                
-                for url_tag in url_tags:
-                    loc = url_tag.find('sm:loc', namespaces)
-                    if loc is not None and loc.text:
-                        url = loc.text.strip()
-                        if base_domain:
-                            parsed = urlparse(url)
-                            if parsed.netloc == base_domain:
-                                urls.append(url)
-                        else:
-                            urls.append(url)
-                
-                if print_lock:
-                    async with print_lock:
-                        print(gradient_text(f"    🌊 Extracted {len(urls)} URLs from sitemap"))
+            # sub-sitemaps are independent, fetch them side by side (bounded by the semaphore)
+            results = await asyncio.gather(*(
+                _check_sitemap_xml(
+                    loc, 
+                    http_request_func, 
+                    print_lock, 
+                    base_domain,
+                    custom_agent,
+                    seen,
+                    depth + 1,
+                    semaphore
+                )
+                for loc in new_sitemaps
+            ), return_exceptions=True)
+            
+            for sub_urls in results:
+                if isinstance(sub_urls, list):
+                    urls.extend(sub_urls)
         
-        except ET.ParseError as e:
+        elif page_urls:
+            for url in page_urls:
+                if base_domain:
+                    parsed = urlparse(url)
+                    if parsed.netloc == base_domain:
+                        urls.append(url)
+                else:
+                    urls.append(url)
+            
             if print_lock:
                 async with print_lock:
-                    print(gradient_text(f"🏴‍☠️ XML parsing failed, trying regex extraction..."))
-            
-            url_pattern = re.compile(r'<loc>(.*?)</loc>', re.IGNORECASE)
-            matches = url_pattern.findall(content)
-            
-            for url in matches:
-                url = url.strip()
+                    print(gradient_text(f"    🌊 Extracted {len(urls)} URLs from sitemap"))
+        
+        else:
+            # broken XML, or no <loc> under the sitemap namespace
+            for url in _LOC_RE.findall(content):
                 if base_domain:
                     parsed = urlparse(url)
                     if parsed.netloc == base_domain:
@@ -185,10 +254,17 @@ async def discover_sitemaps(base_url, http_request_func, print_lock=None, custom
         async with print_lock:
             print(gradient_text(f"🗺️  Checking for common sitemap locations..."))
 
-    for path in common_sitemap_paths:
-        sitemap_url = urljoin(base_url, path)
+    sitemap_urls = [cached_urljoin(base_url, path) for path in common_sitemap_paths]
+    # probe every location at once, results come back in the same order
+    responses = await asyncio.gather(*(
+        http_request_func(sitemap_url, timeout=5, custom_agent=custom_agent)
+        for sitemap_url in sitemap_urls
+    ), return_exceptions=True)
+
+    for path, sitemap_url, response in zip(common_sitemap_paths, sitemap_urls, responses):
         try:
-            response = await http_request_func(sitemap_url, timeout=5, custom_agent=custom_agent)
+            if isinstance(response, Exception):
+                continue
             if response['done'] and response['response_code'] == 200:
                 if 'xml' in response.get('content_type', '').lower() or \
                    response['content'].strip().startswith('<?xml'):
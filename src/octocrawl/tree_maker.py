@@ -1,5 +1,5 @@
 from octocrawl.ui import colorize_status, gradient_text, format_keywords, PURPLE, ORANGE, LIGHT_ORANGE, PEACH, LIGHT_PEACH, GREEN, YELLOW
-from urllib.parse import urljoin
+from octocrawl.parser import cached_urljoin
 import sys
 
 class TreeMaker:
@@ -7,6 +7,9 @@ class TreeMaker:
         self.base_url = base_url
         self.noshow = noshow if noshow is not None else []
         self.display_only = display_only if display_only is not None else []
+        # str.endswith() takes a tuple and checks every suffix in C
+        self._display_suffixes = tuple(ext.lower() for ext in self.display_only)
+        self._noshow_suffixes = tuple(ext.lower() for ext in self.noshow)
         self._valid_children_cache = {}
 
     def colorize_status(self, status):
@@ -16,11 +19,11 @@ class TreeMaker:
         return text
 
     def _should_display_file(self, key):
-        if self.display_only:
-            return any(key.lower().endswith(ext.lower()) for ext in self.display_only)
+        if self._display_suffixes:
+            return key.lower().endswith(self._display_suffixes)
 
-        if self.noshow:
-            return not any(key.lower().endswith(ext.lower()) for ext in self.noshow)
+        if self._noshow_suffixes:
+            return not key.lower().endswith(self._noshow_suffixes)
 
         return True
 
@@ -48,10 +51,7 @@ class TreeMaker:
         self._valid_children_cache[id(node)] = result
         return result
 
-    def print_tree(self, data, show_url=False, prefix="", base_path_url=None, output_stream=sys.stdout):
-        if base_path_url is None:
-            base_path_url = self.base_url
-
+    def _visible_items(self, data):
         filtered_data = {}
         for key, value in data.items():
             if not isinstance(value, dict):
@@ -70,10 +70,31 @@ class TreeMaker:
             else:
                 filtered_data[key] = value
         
-        items = list(filtered_data.items())
-        for index, (key, value) in enumerate(items):
-            is_last = index == len(items) - 1
-            pointer = gradient_text("└── ") if is_last else gradient_text("├── ")
+        last_index = len(filtered_data) - 1
+        return iter([(index == last_index, key, value) for index, (key, value) in enumerate(filtered_data.items())])
+
+    def print_tree(self, data, show_url=False, prefix="", base_path_url=None, output_stream=sys.stdout):
+        # lines are collected and written in one go
+        if base_path_url is None:
+            base_path_url = self.base_url
+
+        lines = []
+
+        # the branch glyphs never change, build their gradients once per render instead of per node
+        last_pointer, mid_pointer = gradient_text("└── "), gradient_text("├── ")
+        pipe_extension = gradient_text("│   ")
+
+        # explicit stack of (remaining items, prefix, base url) instead of one recursive call per directory
+        stack = [(self._visible_items(data), prefix, base_path_url)]
+        while stack:
+            items, prefix, base_path_url = stack[-1]
+            entry = next(items, None)
+            if entry is None:
+                stack.pop()
+                continue
+
+            is_last, key, value = entry
+            pointer = last_pointer if is_last else mid_pointer
 
             is_endpoint = '_data' in value
             children = {k: v for k, v in value.items() if k != '_data'}
@@ -84,7 +105,7 @@ class TreeMaker:
             keywords_str = ""
             
             base_for_join = base_path_url if base_path_url.endswith('/') else base_path_url + '/'
-            current_url = urljoin(base_for_join, key)
+            current_url = cached_urljoin(base_for_join, key)
 
             if is_endpoint:
                 url_data = value['_data']
@@ -100,12 +121,15 @@ class TreeMaker:
             elif is_directory and show_url:
                 display_name = current_url
 
-            print(prefix + pointer + display_name + " " + colorize_status(status) + keywords_str, file=output_stream)
+            lines.append(f"{prefix}{pointer}{display_name} {colorize_status(status)}{keywords_str}")
 
             if is_directory:
-                extension = "    " if is_last else gradient_text("│   ")
-                self.print_tree(children, show_url, prefix + extension, base_path_url=current_url, output_stream=output_stream)
+                extension = "    " if is_last else pipe_extension
+                stack.append((self._visible_items(children), prefix + extension, current_url))
+
+        if lines:
+            lines.append("")
+            output_stream.write("\n".join(lines))
 
     def clean_url_join(self, base, path):
-        from urllib.parse import urljoin
-        return urljoin(base, path)
\ No newline at end of file
+        return cached_urljoin(base, path)
\ No newline at end of file
@@ -1,3 +1,4 @@
+import functools
 import shutil
 import sys
 from random import randint
@@ -24,17 +25,21 @@ def whole_line():
 def gradient_text(text, start_color=PURPLE, end_color=ORANGE):
     if not sys.stdout.isatty():
         return text
-    
-    result = ""
+    return _render_gradient(text, start_color, end_color)
+
+# banners, separators and tree glyphs come back with the same text over and over
+@functools.lru_cache(maxsize=1024)
+def _render_gradient(text, start_color, end_color):
+    parts = []
     length = len(text)
     for i, char in enumerate(text):
         ratio = i / max(length - 1, 1)
         r = int(start_color[0] + ratio * (end_color[0] - start_color[0]))
         g = int(start_color[1] + ratio * (end_color[1] - start_color[1]))
         b = int(start_color[2] + ratio * (end_color[2] - start_color[2]))
-        result += f"\033[38;2;{r};{g};{b}m{char}"
-    result += "\033[0m"
-    return result
+        parts.append(f"\033[38;2;{r};{g};{b}m{char}")
+    parts.append("\033[0m")
+    return "".join(parts)
 
 def colored_text(text, foreground_color, background_color=None):
     if not sys.stdout.isatty():
@@ -1,30 +1,60 @@
 import random
+import mmap
 import importlib.resources
+from array import array
 
 
 class RandomUserAgent:
-    _user_agents = None
+    # the file stays mapped, only the picked line gets decoded
+    _data = None
+    _starts = None
+    _ends = None
+    _count = 0
+    _rng = random.Random()
+
+    @classmethod
+    def _index_lines(cls, data):
+        starts, ends = array('Q'), array('Q')
+        pos, size = 0, len(data)
+        while pos < size:
+            end = data.find(b'\n', pos)
+            if end == -1:
+                end = size
+            line = data[pos:end]
+            stripped = line.strip()
+            if stripped:
+                start = pos + len(line) - len(line.lstrip())
+                starts.append(start)
+                ends.append(start + len(stripped))
+            pos = end + 1
+        cls._data, cls._starts, cls._ends = data, starts, ends
+        cls._count = len(starts)
 
     @classmethod
     def _load_user_agents(cls):
-        if cls._user_agents is None:
+        if cls._data is None:
             try:
                 ref = importlib.resources.files("octocrawl").joinpath("user_agents.txt")
                 with importlib.resources.as_file(ref) as path:
-                    with open(path, encoding="utf-8") as f:
-                        cls._user_agents = [line.strip() for line in f if line.strip()]
+                    with open(path, "rb") as f:
+                        if not f.seek(0, 2):
+                            raise ValueError("user_agents.txt is empty")
+                        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
 
-                if not cls._user_agents:
+                cls._index_lines(data)
+                if not cls._starts:
                     raise ValueError("user_agents.txt is empty")
 
             except Exception as e:
                 print(f"Warning: Could not load user agents list: {e}")
-                cls._user_agents = [
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-                ]
+                cls._index_lines(
+                    b"Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+                )
 
     @classmethod
     def get(cls) -> str:
-        if cls._user_agents is None:
+        if cls._data is None:
             cls._load_user_agents()
-        return random.choice(cls._user_agents)
\ No newline at end of file
+        i = cls._rng.randrange(cls._count)
+        return cls._data[cls._starts[i]:cls._ends[i]].decode("utf-8")
+